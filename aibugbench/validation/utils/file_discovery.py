@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 from aibugbench.validation.errors import SchemaError
@@ -20,26 +21,22 @@ def find_prompt2_files(run_dir: Path) -> tuple[Path, Path]:
         SchemaError: if the expected files are missing or misnamed.
     """
 
-    root = Path(run_dir).resolve()
-    yaml_path = root / YAML_NAME
-    json_path = root / JSON_NAME
+    # Join and probe as plain strings; only the returned values become Paths.
+    root = os.fspath(Path(run_dir).resolve())
+    yaml_s = os.path.join(root, YAML_NAME)
+    json_s = os.path.join(root, JSON_NAME)
 
-    if not yaml_path.exists():
-        alternate = root / _YML_ALTERNATE
-        if alternate.exists():
+    if not os.path.exists(yaml_s):
+        if os.path.exists(os.path.join(root, _YML_ALTERNATE)):
             raise SchemaError(f"Prompt 2 YAML must be named {YAML_NAME} (found {_YML_ALTERNATE}).")
         raise SchemaError(f"Missing Prompt 2 YAML submission: {YAML_NAME}")
 
-    if yaml_path.suffix.lower() not in {".yaml"}:
-        raise SchemaError(f"Prompt 2 YAML must use .yaml extension (got {yaml_path.suffix}).")
-
-    if not json_path.exists():
+    if not os.path.exists(json_s):
         raise SchemaError(f"Missing Prompt 2 JSON submission: {JSON_NAME}")
 
-    if json_path.suffix.lower() != ".json":
-        raise SchemaError(f"Prompt 2 JSON must use .json extension (got {json_path.suffix}).")
-
-    return yaml_path, json_path
+    # Extensions are fixed by YAML_NAME / JSON_NAME, so no suffix check is needed
+    # here; a misnamed .yml submission is reported above.
+    return Path(yaml_s), Path(json_s)
 
 
 __all__ = ["JSON_NAME", "YAML_NAME", "find_prompt2_files"]
@@ -5,14 +5,27 @@ AI Code Benchmark Package
 A comprehensive tool for evaluating AI models' coding capabilities.
 """
 
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 __version__ = "1.0.0"
 __author__ = "sMiNT0S, Polle"
 
-from .scoring import BenchmarkScorer
-from .utils import ensure_directories, load_test_data
+if TYPE_CHECKING:
+    from .scoring import BenchmarkScorer
+    from .utils import ensure_directories, load_test_data
+    from .validators import PromptValidators
 
-# Import main classes for easy access
-from .validators import PromptValidators
+# Public names resolve lazily (PEP 562) so callers that only need a light
+# helper such as ``ensure_directories`` do not pay for importing validators.
+_LAZY_ATTRS = {
+    "BenchmarkScorer": ".scoring",
+    "PromptValidators": ".validators",
+    "ensure_directories": ".utils",
+    "load_test_data": ".utils",
+}
 
 __all__ = [
     "BenchmarkScorer",
@@ -20,3 +33,16 @@ __all__ = [
     "ensure_directories",
     "load_test_data",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # cache so later lookups bypass __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
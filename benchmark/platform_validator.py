@@ -12,14 +12,18 @@ import os
 if os.name == "nt":  # Windows
     os.environ.setdefault("PYTHONIOENCODING", "utf-8")
 
+import atexit
+import contextlib
 from datetime import datetime
 import json
 from pathlib import Path
 import platform
+import signal
 import subprocess
 import sys
+import threading
 import time
-from typing import Any
+from typing import IO, Any
 
 # subprocess rationale: controlled internal invocations (fixed arg lists, shell=False);
 # no user-supplied strings interpolated, so injection risk is minimal (Bandit B404/B603 noted).
@@ -27,16 +31,106 @@ from typing import Any
 # Platform detection
 CURRENT_PLATFORM = platform.system().lower()
 PLATFORM_MAPPING = {"windows": "windows-latest", "darwin": "macos-latest", "linux": "ubuntu-latest"}
+# Interpreter version is fixed for the process lifetime
+_PY_VERSION = sys.version
+# Seconds to wait for the pipe readers once a timed-out child has been killed
+_READER_GRACE = 5.0
+# POSIX children get their own process group so a timeout can kill grandchildren
+_NEW_SESSION = os.name == "posix"
+
+
+def _drain(stream: IO[bytes], sink: bytearray) -> None:
+    """Copy a child pipe into ``sink`` until EOF."""
+    with stream:
+        for chunk in iter(lambda: stream.read(65536), b""):
+            sink += chunk
+
+
+def _run_capturing(cmd: list[str], cwd: Path, timeout: float) -> tuple[str, str]:
+    """Run ``cmd`` draining stdout/stderr on background threads.
+
+    Output is accumulated as raw bytes and decoded once the child exits.
+    Raises the same ``TimeoutExpired`` / ``CalledProcessError`` as
+    ``subprocess.run(..., check=True)``. As there, ``timeout`` also covers
+    the pipes reaching EOF, so a grandchild holding them open cannot stall us,
+    and the child is killed if the wait is interrupted for any reason.
+    """
+    proc = subprocess.Popen(  # noqa: S603  # Intentional for platform validation
+        cmd,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=_NEW_SESSION,
+    )
+    out_buf, err_buf = bytearray(), bytearray()
+    readers = [
+        threading.Thread(target=_drain, args=(proc.stdout, out_buf), daemon=True),
+        threading.Thread(target=_drain, args=(proc.stderr, err_buf), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+    deadline = time.monotonic() + timeout
+    try:
+        returncode = proc.wait(timeout=timeout)
+        for reader in readers:
+            reader.join(max(0.0, deadline - time.monotonic()))
+        if any(reader.is_alive() for reader in readers):
+            raise subprocess.TimeoutExpired(cmd, timeout)
+    except BaseException:
+        # Timeout, Ctrl-C (which never reaches the child's own session) or any
+        # other error: like subprocess.run, never leave the child running.
+        if _NEW_SESSION:
+            with contextlib.suppress(ProcessLookupError):
+                os.killpg(proc.pid, signal.SIGKILL)  # child and grandchildren
+        proc.kill()
+        proc.wait()
+        # Bounded: on Windows a surviving grandchild may still hold the pipes
+        for reader in readers:
+            reader.join(_READER_GRACE)
+        raise
+
+    stdout = out_buf.decode("utf-8", errors="replace")
+    stderr = err_buf.decode("utf-8", errors="replace")
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd, output=stdout, stderr=stderr)
+    return stdout, stderr
+
+
+# Interactive terminals get lines immediately; pipes/files (CI logs) are
+# batched and written in one go at flush_output() boundaries: before each
+# benchmark subprocess, once its verdict is known and before exit, so a killed
+# job loses at most the lines of the step in flight.
+_STDOUT_IS_TTY = bool(sys.stdout and sys.stdout.isatty())
+_pending_output: list[str] = []
+
+
+def _write_safely(text: str) -> None:
+    try:
+        sys.stdout.write(text)
+    except UnicodeEncodeError:
+        # Fallback to ASCII-safe version
+        sys.stdout.write(text.encode("ascii", errors="replace").decode("ascii"))
+    sys.stdout.flush()
+
+
+def flush_output() -> None:
+    """Write any buffered safe_print lines to stdout."""
+    if not _pending_output:
+        return
+    text = "\n".join(_pending_output) + "\n"
+    _pending_output.clear()
+    _write_safely(text)
+
+
+atexit.register(flush_output)
 
 
 def safe_print(message: str) -> None:
     """Print message with Unicode safety for Windows cmd/PowerShell."""
-    try:
-        print(message)
-    except UnicodeEncodeError:
-        # Fallback to ASCII-safe version
-        safe_message = message.encode("ascii", errors="replace").decode("ascii")
-        print(safe_message)
+    if not _STDOUT_IS_TTY:
+        _pending_output.append(message)
+        return
+    _write_safely(message + "\n")
 
 
 class PlatformBenchmarkValidator:
@@ -59,6 +153,7 @@ class PlatformBenchmarkValidator:
     def run_single_benchmark(self, model_name: str) -> dict[str, Any]:
         """Run benchmark for a single model and capture results."""
         safe_print(f"Running benchmark for model: {model_name}")
+        flush_output()  # surface progress before the (long) benchmark subprocess
 
         # Record start time for performance monitoring
         start_time = time.time()
@@ -80,15 +175,10 @@ class PlatformBenchmarkValidator:
         ]
 
         try:
-            result = subprocess.run(  # noqa: S603  # Intentional for platform validation
+            stdout, stderr = _run_capturing(
                 cmd,
                 cwd=self.project_root,
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
                 timeout=300,  # 5-minute timeout
-                check=True,
             )
 
             # Calculate execution time
@@ -116,11 +206,11 @@ class PlatformBenchmarkValidator:
                 "platform_ci": PLATFORM_MAPPING.get(CURRENT_PLATFORM, "unknown"),
                 "execution_time": execution_time,
                 "timestamp": datetime.now().isoformat(),
-                "python_version": sys.version,
+                "python_version": _PY_VERSION,
                 "model_name": model_name,
                 "results": benchmark_data,  # This is the loaded JSON data
-                "stdout": result.stdout,
-                "stderr": result.stderr,
+                "stdout": stdout,
+                "stderr": stderr,
             }
 
             return platform_results
@@ -134,22 +224,20 @@ class PlatformBenchmarkValidator:
 
     def extract_scores(self, results: dict[str, Any]) -> dict[str, float]:
         """Extract normalized scores from benchmark results."""
-        scores = {}
+        scores: dict[str, float] = {}
 
         # Navigate the structure: results["results"] contains the loaded JSON
-        if "results" not in results:
+        benchmark_data = results.get("results")
+        if not isinstance(benchmark_data, dict):
             return scores
 
-        benchmark_data = results["results"]
-
         # JSON structure: models -> model_name -> prompts -> prompt_name
-        if isinstance(benchmark_data, dict) and "models" in benchmark_data:
-            for _model_name, model_data in benchmark_data["models"].items():
-                if "prompts" in model_data:
-                    for prompt_key, prompt_data in model_data["prompts"].items():
-                        if isinstance(prompt_data, dict) and "score" in prompt_data:
-                            # Round to 2 decimal places for comparison
-                            scores[prompt_key] = round(float(prompt_data["score"]), 2)
+        for model_data in benchmark_data.get("models", {}).values():
+            for prompt_key, prompt_data in model_data.get("prompts", {}).items():
+                score = prompt_data.get("score") if isinstance(prompt_data, dict) else None
+                if score is not None:
+                    # Round to 2 decimal places for comparison
+                    scores[prompt_key] = round(float(score), 2)
 
         return scores
 
@@ -183,20 +271,27 @@ class PlatformBenchmarkValidator:
 
         for prompt in all_prompts:
             prompt_scores = {}
+            # Track the spread while collecting; lo < hi iff the scores differ
+            lo = hi = None
             for platform, scores in platform_scores.items():
                 if prompt in scores:
-                    prompt_scores[platform] = scores[prompt]
+                    score = scores[prompt]
+                    prompt_scores[platform] = score
+                    if lo is None or score < lo:
+                        lo = score
+                    if hi is None or score > hi:
+                        hi = score
 
             comparison["score_comparison"][prompt] = prompt_scores
 
             # Check for score inconsistencies (zero tolerance)
-            if len(set(prompt_scores.values())) > 1:
+            if lo is not None and hi > lo:
                 comparison["status"] = "inconsistent"
                 comparison["inconsistencies"].append(
                     {
                         "prompt": prompt,
                         "scores": prompt_scores,
-                        "difference": max(prompt_scores.values()) - min(prompt_scores.values()),
+                        "difference": hi - lo,
                     }
                 )
 
@@ -279,6 +374,8 @@ class PlatformBenchmarkValidator:
                 "expected_score": expected_score,
                 "within_tolerance": False,
             }
+        finally:
+            flush_output()  # surface the verdict before results are written
 
 
 def main() -> None:
@@ -298,13 +395,16 @@ def main() -> None:
     output_path = validator.save_results(results, filename)
 
     safe_print(f"Results saved to: {output_path}")
+    flush_output()
 
     # Exit with appropriate code
     if results.get("status") == "error" or not results.get("within_tolerance", False):
         safe_print("Platform validation failed")
+        flush_output()
         sys.exit(1)
     else:
         safe_print("Platform validation successful")
+        flush_output()
         sys.exit(0)
 
 
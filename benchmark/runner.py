@@ -7,6 +7,7 @@ Test runner utilities for the AI Code Benchmark
 import contextlib
 import os
 from pathlib import Path
+import shutil
 import subprocess  # Bandit B404/B603: controlled usage; fixed arg list [sys.executable, script]
 import sys
 import tempfile
@@ -37,17 +38,19 @@ class TestRunner:
         }
 
         try:
-            # Set up environment
+            # Set up environment from the current os.environ on every call, so
+            # later changes (e.g. the sandbox's scrubbed env) reach the child
+            parent = script_path.parent
             env = os.environ.copy()
-            env["PYTHONPATH"] = str(script_path.parent)
+            env["PYTHONPATH"] = os.fspath(parent)
 
             # Run the script
             process = subprocess.run(
-                [sys.executable, str(script_path), *args],
+                [sys.executable, os.fspath(script_path), *args],
                 capture_output=True,
                 text=True,
                 timeout=timeout,
-                cwd=script_path.parent,
+                cwd=parent,
                 env=env,
             )
 
@@ -76,17 +79,24 @@ class TestRunner:
         user_data_src = self.test_data_dir / "user_data.json"
         user_data_dst = target_dir / "user_data.json"
 
-        if user_data_src.exists() and not user_data_dst.exists():
-            import shutil
-
-            shutil.copy2(user_data_src, user_data_dst)
+        # A real copy, never a hardlink: scripts may rewrite user_data.json in
+        # target_dir and must not reach the checked-in fixture through it.
+        # Open both ends directly and let the OS report the edge cases rather
+        # than stat-ing src and dst up front; "xb" refuses an existing dst.
+        try:
+            with open(user_data_src, "rb") as fsrc, open(user_data_dst, "xb") as fdst:
+                shutil.copyfileobj(fsrc, fdst)
+        except FileExistsError:
+            return  # already staged
+        except FileNotFoundError:
+            if user_data_src.exists():
+                raise  # target directory is missing
+            return  # no fixture to stage
+        shutil.copystat(user_data_src, user_data_dst)
 
     def cleanup_test_environment(self, target_dir: Path) -> None:
         """Clean up temporary test files."""
-        temp_files = ["user_data.json", "config.yaml"]
-
-        for filename in temp_files:
-            file_path = target_dir / filename
-            if file_path.exists():
-                with contextlib.suppress(OSError):
-                    file_path.unlink()  # Ignore errors during cleanup
+        # Unlink optimistically: one syscall per name, missing files are ignored
+        for filename in ("user_data.json", "config.yaml"):
+            with contextlib.suppress(OSError):
+                os.unlink(os.path.join(target_dir, filename))
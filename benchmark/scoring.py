@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 
+from types import MappingProxyType
 from typing import Any, TypedDict
 
 
@@ -24,6 +25,17 @@ class _Comparison(TypedDict):
 class BenchmarkScorer:
     """Handles scoring and grading for the benchmark."""
 
+    # Shared lookup tables, built once at class creation instead of per call
+    _PROMPT_IDS = ("prompt_1", "prompt_2", "prompt_3", "prompt_4")
+    _PROMPT_NAMES = MappingProxyType(
+        {
+            "prompt_1": "Code Refactoring",
+            "prompt_2": "YAML/JSON Handling",
+            "prompt_3": "Data Transformation",
+            "prompt_4": "API Integration",
+        }
+    )
+
     def __init__(self) -> None:
         self.grade_thresholds = {
             "A+": 95,
@@ -37,12 +49,14 @@ class BenchmarkScorer:
             "F": 0,
         }
 
-        self.prompt_weights = {
-            "prompt_1": 1.0,  # All prompts weighted equally
-            "prompt_2": 1.0,
-            "prompt_3": 1.0,
-            "prompt_4": 1.0,
-        }
+        self.prompt_weights = MappingProxyType(
+            {
+                "prompt_1": 1.0,  # All prompts weighted equally
+                "prompt_2": 1.0,
+                "prompt_3": 1.0,
+                "prompt_4": 1.0,
+            }
+        )
 
     def calculate_grade(self, percentage: float) -> str:
         """Convert percentage score to letter grade."""
@@ -77,12 +91,7 @@ class BenchmarkScorer:
         strengths = []
         weaknesses = []
 
-        prompt_names = {
-            "prompt_1": "Code Refactoring",
-            "prompt_2": "YAML/JSON Handling",
-            "prompt_3": "Data Transformation",
-            "prompt_4": "API Integration",
-        }
+        prompt_names = self._PROMPT_NAMES
 
         for prompt_id, prompt_result in prompts.items():
             if "error" in prompt_result:
@@ -187,66 +196,63 @@ class BenchmarkScorer:
             "detailed_comparison": [],
         }
 
-        # Find best overall
+        # Single pass over models: best overall, best per prompt and consistency
         best_score = 0
+        best_by_prompt: dict[str, tuple[Any, str | None]] = dict.fromkeys(
+            self._PROMPT_IDS, (0, None)
+        )
         for model_name, model_result in models.items():
-            if "error" not in model_result:
-                score = model_result.get("overall_score", 0)
-                if score > best_score:
-                    best_score = score
-                    comparison["best_overall"] = {
-                        "model": model_name,
-                        "score": score,
-                        "percentage": model_result.get("percentage", 0),
-                    }
-
-        # Find best by prompt
-        for prompt_id in ["prompt_1", "prompt_2", "prompt_3", "prompt_4"]:
-            best_prompt_score = 0
-            best_prompt_model = None
-
-            for model_name, model_result in models.items():
-                if "error" not in model_result and "prompts" in model_result:
-                    prompt_result = model_result["prompts"].get(prompt_id, {})
-                    score = prompt_result.get("score", 0)
-
-                    if score > best_prompt_score:
-                        best_prompt_score = score
-                        best_prompt_model = model_name
+            if "error" in model_result:
+                continue
+
+            score = model_result.get("overall_score", 0)
+            if score > best_score:
+                best_score = score
+                comparison["best_overall"] = {
+                    "model": model_name,
+                    "score": score,
+                    "percentage": model_result.get("percentage", 0),
+                }
 
+            if "prompts" not in model_result:
+                continue
+            prompts = model_result["prompts"]
+
+            for prompt_id in self._PROMPT_IDS:
+                prompt_score = prompts.get(prompt_id, {}).get("score", 0)
+                if prompt_score > best_by_prompt[prompt_id][0]:
+                    best_by_prompt[prompt_id] = (prompt_score, model_name)
+
+            # Consistency analysis
+            scores = []
+            for prompt_result in prompts.values():
+                if "score" in prompt_result:
+                    max_score = prompt_result.get("max_score", 25)
+                    percentage = (prompt_result["score"] / max_score * 100) if max_score > 0 else 0
+                    scores.append(percentage)
+
+            if scores:
+                avg_score = sum(scores) / len(scores)
+                variance = sum((s - avg_score) ** 2 for s in scores) / len(scores)
+                std_dev = variance**0.5  # population std dev
+
+                comparison["consistency_analysis"][model_name] = {
+                    "average_percentage": round(avg_score, 1),
+                    "standard_deviation": round(std_dev, 1),
+                    "consistency_rating": "High"
+                    if std_dev < 10
+                    else "Medium"
+                    if std_dev < 20
+                    else "Low",
+                }
+
+        for prompt_id, (best_prompt_score, best_prompt_model) in best_by_prompt.items():
             if best_prompt_model:
                 comparison["best_by_prompt"][prompt_id] = {
                     "model": best_prompt_model,
                     "score": best_prompt_score,
                 }
 
-        # Consistency analysis
-        for model_name, model_result in models.items():
-            if "error" not in model_result and "prompts" in model_result:
-                scores = []
-                for _prompt_id, prompt_result in model_result["prompts"].items():
-                    if "score" in prompt_result:
-                        max_score = prompt_result.get("max_score", 25)
-                        percentage = (
-                            (prompt_result["score"] / max_score * 100) if max_score > 0 else 0
-                        )
-                        scores.append(percentage)
-
-                if scores:
-                    avg_score = sum(scores) / len(scores)
-                    variance = sum((s - avg_score) ** 2 for s in scores) / len(scores)
-                    std_dev = variance**0.5
-
-                    comparison["consistency_analysis"][model_name] = {
-                        "average_percentage": round(avg_score, 1),
-                        "standard_deviation": round(std_dev, 1),
-                        "consistency_rating": "High"
-                        if std_dev < 10
-                        else "Medium"
-                        if std_dev < 20
-                        else "Low",
-                    }
-
         return comparison
 
     def generate_badge(self, percentage: float) -> str:
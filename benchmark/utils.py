@@ -4,9 +4,90 @@
 Utility functions for AI Code Benchmark
 """
 
+from collections.abc import Mapping
+import functools
 import json
+import os
 from pathlib import Path
-from typing import Any, TypedDict
+import stat
+from types import MappingProxyType
+from typing import Any, Final, TypedDict
+
+# Files every model submission must provide, in report order
+_REQUIRED_FILES: Final[tuple[str, ...]] = (
+    "prompt_1_solution.py",
+    "prompt_2_config_fixed.yaml",
+    "prompt_2_config.json",
+    "prompt_3_transform.py",
+    "prompt_4_api_sync.py",
+)
+
+# (filename, placeholder content) written by create_submission_template
+_TEMPLATE_FILES: Final[tuple[tuple[str, str], ...]] = (
+    (
+        "prompt_1_solution.py",
+        "# Your refactored version of process_records.py\n# TODO: Implement your solution here\n",
+    ),
+    (
+        "prompt_2_config_fixed.yaml",
+        "# Your corrected version of config.yaml\n"
+        "# TODO: Fix all YAML syntax and structure issues\n",
+    ),
+    (
+        "prompt_2_config.json",
+        "# JSON conversion of the corrected config\n"
+        "# TODO: Convert YAML to JSON with proper data types\n",
+    ),
+    (
+        "prompt_3_transform.py",
+        "# Your transform_and_enrich_users function\n# TODO: Implement data transformation logic\n",
+    ),
+    (
+        "prompt_4_api_sync.py",
+        "# Your sync_users_to_crm function\n"
+        "# TODO: Implement API synchronization with error handling\n",
+    ),
+)
+
+_PROMPT_IDS: Final[tuple[str, ...]] = ("prompt_1", "prompt_2", "prompt_3", "prompt_4")
+
+# Short prompt labels used by the comparison chart
+_CHART_PROMPT_NAMES: Final[Mapping[str, str]] = MappingProxyType(
+    {
+        "prompt_1": "Refactoring",
+        "prompt_2": "YAML/JSON",
+        "prompt_3": "Transformation",
+        "prompt_4": "API Simulation",
+    }
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_bytes(path: str, mtime_ns: int, size: int) -> bytes:
+    """Return the contents of ``path``; cached per (path, mtime_ns, size) version."""
+    return Path(path).read_bytes()
+
+
+def _read_bytes(path: Path) -> bytes | None:
+    """Read ``path`` once per on-disk version, or return None if it is missing.
+
+    Repeated loads (e.g. one benchmark instance per model) reuse the bytes until
+    the file's mtime or size changes. Only the immutable bytes are cached, so
+    every caller still gets freshly parsed objects it may mutate.
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return _cached_bytes(os.fspath(path), st.st_mtime_ns, st.st_size)
+
+
+def _decode_text(raw: bytes) -> str:
+    """Decode UTF-8 file contents, normalising newlines like text mode."""
+    text = raw.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
 
 def load_test_data(test_data_dir: Path) -> dict[str, Any]:
@@ -14,22 +95,19 @@ def load_test_data(test_data_dir: Path) -> dict[str, Any]:
     data = {}
 
     # Load user data
-    user_data_file = test_data_dir / "user_data.json"
-    if user_data_file.exists():
-        with open(user_data_file) as f:
-            data["user_data"] = json.load(f)
+    raw = _read_bytes(test_data_dir / "user_data.json")
+    if raw is not None:
+        data["user_data"] = json.loads(raw)
 
     # Load original broken config
-    config_file = test_data_dir / "config.yaml"
-    if config_file.exists():
-        with open(config_file) as f:
-            data["original_config"] = f.read()
+    raw = _read_bytes(test_data_dir / "config.yaml")
+    if raw is not None:
+        data["original_config"] = _decode_text(raw)
 
     # Load original broken script
-    script_file = test_data_dir / "process_records.py"
-    if script_file.exists():
-        with open(script_file) as f:
-            data["original_script"] = f.read()
+    raw = _read_bytes(test_data_dir / "process_records.py")
+    if raw is not None:
+        data["original_script"] = _decode_text(raw)
 
     return data
 
@@ -48,44 +126,18 @@ def create_submission_template(submissions_dir: Path) -> None:
     template_dir = submissions_dir / "templates" / "template"
     template_dir.mkdir(parents=True, exist_ok=True)
 
-    # Create template files
-    files_to_create = [
-        (
-            "prompt_1_solution.py",
-            "# Your refactored version of process_records.py\n"
-            "# TODO: Implement your solution here\n",
-        ),
-        (
-            "prompt_2_config_fixed.yaml",
-            "# Your corrected version of config.yaml\n"
-            "# TODO: Fix all YAML syntax and structure issues\n",
-        ),
-        (
-            "prompt_2_config.json",
-            "# JSON conversion of the corrected config\n"
-            "# TODO: Convert YAML to JSON with proper data types\n",
-        ),
-        (
-            "prompt_3_transform.py",
-            "# Your transform_and_enrich_users function\n"
-            "# TODO: Implement data transformation logic\n",
-        ),
-        (
-            "prompt_4_api_sync.py",
-            "# Your sync_users_to_crm function\n"
-            "# TODO: Implement API synchronization with error handling\n",
-        ),
-    ]
-
-    for filename, content in files_to_create:
-        file_path = template_dir / filename
-        if not file_path.exists():
-            with open(file_path, "w") as f:
+    # Plain os.path strings: no Path object per template file. Each name is
+    # checked with the filesystem's own case rules, as Path.exists() did.
+    base = os.fspath(template_dir)
+    for filename, content in _TEMPLATE_FILES:
+        file_path = os.path.join(base, filename)
+        if not os.path.exists(file_path):
+            with open(file_path, "w", encoding="utf-8") as f:
                 f.write(content)
 
     # Create README for the template
-    readme_path = template_dir / "README.md"
-    if not readme_path.exists():
+    readme_path = os.path.join(base, "README.md")
+    if not os.path.exists(readme_path):
         readme_content = """# Model Submission Template
 
 Copy this template directory and rename it to your model name (e.g., `gpt4`,
@@ -114,10 +166,14 @@ Each prompt is worth 25 points (100 total):
 
 Good luck!
 """
-        with open(readme_path, "w") as f:
+        with open(readme_path, "w", encoding="utf-8") as f:
             f.write(readme_content)
 
 
+# Every possible ranking bar (0-50 filled cells), built once
+_BARS = tuple("█" * n + "░" * (50 - n) for n in range(51))
+
+
 def generate_comparison_chart(results: dict[str, Any], output_file: Path) -> None:
     """Generate a simple text-based comparison chart."""
     if "comparison" not in results or "ranking" not in results["comparison"]:
@@ -127,61 +183,48 @@ def generate_comparison_chart(results: dict[str, Any], output_file: Path) -> Non
     if not ranking:
         return
 
-    chart_content = []
-    chart_content.append("AI CODE BENCHMARK - COMPARISON CHART")
-    chart_content.append("=" * 50)
-    chart_content.append("")
-
-    # Overall ranking
-    chart_content.append("OVERALL RANKING:")
-    chart_content.append("-" * 20)
-    for i, model in enumerate(ranking, 1):
-        percentage = model["percentage"]
-        bar_length = int(percentage / 2)  # Scale to 50 chars max
-        bar = "█" * bar_length + "░" * (50 - bar_length)
-        chart_content.append(f"{i:2d}. {model['model']:<20} {bar} {percentage:5.1f}%")
-
-    chart_content.append("")
-
-    # Prompt-specific performance
-    if "prompt_performance" in results["comparison"]:
-        chart_content.append("PROMPT-SPECIFIC PERFORMANCE:")
-        chart_content.append("-" * 30)
-
-        prompt_names = {
-            "prompt_1": "Refactoring",
-            "prompt_2": "YAML/JSON",
-            "prompt_3": "Transformation",
-            "prompt_4": "API Simulation",
-        }
-
-        for prompt_id, perf_data in results["comparison"]["prompt_performance"].items():
-            prompt_name = prompt_names.get(prompt_id, prompt_id)
-            chart_content.append(f"\n{prompt_name}:")
-            chart_content.append(f"  Best Score: {perf_data['best_score']:.2f}/25")
-            chart_content.append(f"  Average: {perf_data['avg_score']:.2f}/25")
-            chart_content.append(f"  Pass Rate: {perf_data['pass_rate']}%")
-
-    # Save chart
+    # Lines are written straight to the (buffered) file instead of being
+    # collected into a list and joined.
     with open(output_file, "w", encoding="utf-8") as f:
-        f.write("\n".join(chart_content))
+        write = f.write
+        write("AI CODE BENCHMARK - COMPARISON CHART\n")
+        write("=" * 50 + "\n\n")
+
+        # Overall ranking
+        write("OVERALL RANKING:\n")
+        write("-" * 20 + "\n")
+        for i, model in enumerate(ranking, 1):
+            percentage = model["percentage"]
+            bar = _BARS[min(50, max(0, int(percentage / 2)))]  # Scale to 50 chars max
+            write(f"{i:2d}. {model['model']:<20} {bar} {percentage:5.1f}%\n")
+
+        # Prompt-specific performance
+        if "prompt_performance" in results["comparison"]:
+            write("\nPROMPT-SPECIFIC PERFORMANCE:\n")
+            write("-" * 30 + "\n")
+
+            for prompt_id, perf_data in results["comparison"]["prompt_performance"].items():
+                prompt_name = _CHART_PROMPT_NAMES.get(prompt_id, prompt_id)
+                write(f"\n{prompt_name}:\n")
+                write(f"  Best Score: {perf_data['best_score']:.2f}/25\n")
+                write(f"  Average: {perf_data['avg_score']:.2f}/25\n")
+                write(f"  Pass Rate: {perf_data['pass_rate']}%\n")
 
 
 def validate_submission_structure(model_dir: Path) -> dict[str, bool]:
     """Validate that a model submission has the correct file structure."""
-    required_files = [
-        "prompt_1_solution.py",
-        "prompt_2_config_fixed.yaml",
-        "prompt_2_config.json",
-        "prompt_3_transform.py",
-        "prompt_4_api_sync.py",
-    ]
-
+    # One stat() per required file instead of an exists() + stat() pair. Looking
+    # names up (rather than matching a directory listing) keeps the filesystem's
+    # own case rules, so case-insensitive volumes accept differently cased names.
+    base = os.fspath(model_dir)
     validation = {}
-    for filename in required_files:
-        file_path = model_dir / filename
-        validation[filename] = file_path.exists() and file_path.stat().st_size > 0
-
+    for filename in _REQUIRED_FILES:
+        try:
+            st = os.stat(os.path.join(base, filename))
+        except OSError:
+            validation[filename] = False  # missing, or unreadable directory
+        else:
+            validation[filename] = stat.S_ISREG(st.st_mode) and st.st_size > 0
     return validation
 
 
@@ -229,44 +272,63 @@ def get_model_statistics(results: dict[str, Any]) -> _ModelStats:
         "prompt_stats": {},
     }
 
-    valid_scores = []
+    # Overall tallies stay in locals and are written to ``stats`` once at the end
+    successful = failed = 0
+    percentage_total = 0
+    highest = 0.0
+    lowest = 100.0
+    # Per-prompt [score_total, score_count, passes, min_score, max_score], filled
+    # in the same single pass over the models
+    prompt_acc: dict[str, list[Any]] = {
+        prompt_id: [0, 0, 0, None, None] for prompt_id in _PROMPT_IDS
+    }
 
     for _model_name, model_result in results["models"].items():
         if "error" in model_result:
-            stats["failed_runs"] += 1
+            failed += 1
             continue
 
-        stats["successful_runs"] += 1
+        successful += 1
         percentage = model_result.get("percentage", 0)
-        valid_scores.append(percentage)
-
-        if percentage > stats["highest_score"]:
-            stats["highest_score"] = float(percentage)
-        if percentage < stats["lowest_score"]:
-            stats["lowest_score"] = float(percentage)
-
-    if valid_scores:
-        stats["average_score"] = float(round(sum(valid_scores) / len(valid_scores), 1))
+        percentage_total += percentage
+        if percentage > highest:
+            highest = float(percentage)
+        if percentage < lowest:
+            lowest = float(percentage)
+
+        prompts = model_result.get("prompts")
+        if not prompts:
+            continue
+        for prompt_id, acc in prompt_acc.items():
+            prompt_result = prompts.get(prompt_id)
+            if prompt_result is None:
+                continue
+            if "score" in prompt_result:
+                score = prompt_result["score"]
+                acc[0] += score
+                acc[1] += 1
+                if acc[3] is None or score < acc[3]:
+                    acc[3] = score
+                if acc[4] is None or score > acc[4]:
+                    acc[4] = score
+            if prompt_result.get("passed"):
+                acc[2] += 1
+
+    stats["successful_runs"] = successful
+    stats["failed_runs"] = failed
+    stats["highest_score"] = highest
+    stats["lowest_score"] = lowest
+    if successful:
+        stats["average_score"] = float(round(percentage_total / successful, 1))
 
     # Prompt-specific statistics
-    for prompt_id in ["prompt_1", "prompt_2", "prompt_3", "prompt_4"]:
-        prompt_scores = []
-        prompt_passes = 0
-
-        for model_result in results["models"].values():
-            if "error" not in model_result and prompt_id in model_result.get("prompts", {}):
-                prompt_result = model_result["prompts"][prompt_id]
-                if "score" in prompt_result:
-                    prompt_scores.append(prompt_result["score"])
-                if prompt_result.get("passed", False):
-                    prompt_passes += 1
-
-        if prompt_scores:
+    for prompt_id, (score_total, count, passes, low, high) in prompt_acc.items():
+        if count:
             stats["prompt_stats"][prompt_id] = {
-                "average_score": float(round(sum(prompt_scores) / len(prompt_scores), 1)),
-                "max_score": float(max(prompt_scores)),
-                "min_score": float(min(prompt_scores)),
-                "pass_rate": float(round(prompt_passes / len(prompt_scores) * 100, 1)),
+                "average_score": float(round(score_total / count, 1)),
+                "max_score": float(high),
+                "min_score": float(low),
+                "pass_rate": float(round(passes / count * 100, 1)),
             }
 
     return stats
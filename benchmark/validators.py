@@ -3,7 +3,7 @@
 """Validators for AI Code Benchmark prompts."""
 
 from collections.abc import Callable
-from functools import wraps
+from functools import lru_cache, wraps
 import importlib.util
 import json
 import os
@@ -157,6 +157,155 @@ class ScoringDetail:
         )
 
 
+# Analyzer patterns, compiled once at import rather than looked up in re's
+# cache on every call (several run once per source line).
+_SQL_CONCAT_RES = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'["\'].*\s*(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER)\s+.*["\'].*\+',
+        r'\+.*["\'].*\s*(WHERE|ORDER BY|GROUP BY|HAVING)\s+.*["\']',
+        r'f["\'].*\s*(SELECT|INSERT|UPDATE|DELETE)\s+.*\{.*\}.*["\']',
+    )
+)
+_SQL_EXECUTE_FORMAT_RE = re.compile(r'\.execute\(["\'].*\{.*\}.*["\']', re.IGNORECASE)
+# Each secret pattern carries the lowercase literal it cannot match without
+# (None when there is none), so a cheap substring test can skip the scan.
+_SECRET_RES = tuple(
+    (literal, re.compile(pattern, re.IGNORECASE), description)
+    for literal, pattern, description in (
+        ("password", r'password\s*=\s*["\'][^"\']{8,}["\']', "Hardcoded password"),
+        ("api_key", r'api_key\s*=\s*["\'][^"\']{16,}["\']', "Hardcoded API key"),
+        ("secret", r'secret\s*=\s*["\'][^"\']{16,}["\']', "Hardcoded secret"),
+        ("token", r'token\s*=\s*["\'][^"\']{20,}["\']', "Hardcoded token"),
+        (None, r'["\'][A-Za-z0-9+/]{40,}={0,2}["\']', "Potential base64 encoded secret"),
+        ("sk-", r'["\']sk-[A-Za-z0-9]{32,}["\']', "OpenAI API key pattern"),
+        ("ghp_", r'["\']ghp_[A-Za-z0-9]{36}["\']', "GitHub personal access token"),
+    )
+)
+# Non-ASCII characters that re.IGNORECASE equates with an ASCII letter
+# (dotted/dotless I, Kelvin sign, long s) but str.lower() does not.
+_ASCII_CASE_TWINS = "\u0130\u0131\u212a\u017f"
+_OPEN_USER_CONCAT_RE = re.compile(r"open\s*\(\s*.*\+.*user.*\)", re.IGNORECASE)
+_UNSAFE_EXEC_RES = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"os\.system\s*\(\s*.*user",
+        r"subprocess\..*shell=True.*user",
+        r"eval\s*\(\s*.*user",
+        r"exec\s*\(\s*.*user",
+    )
+)
+_FOR_IN_RE = re.compile(r"^\s*for\s+\w+\s+in\s+")
+_FOR_RE = re.compile(r"\s*for\s+")
+_LIST_MEMBERSHIP_RE = re.compile(r"if\s+.*\s+in\s+\[.*\]:")
+_DEF_RE = re.compile(r"\s*def\s+(\w+)\s*\(")
+_SINGLE_LETTER_ASSIGN_RE = re.compile(r"\b[a-z]\s*=")
+_NUMBERED_ASSIGN_RE = re.compile(r"\b\w*\d+\w*\s*=")
+_COMPLEX_IF_RE = re.compile(r"if\s+.*\sand\s.*\sand\s")
+
+# First output line whose first non-blank character opens a JSON array
+_JSON_ARRAY_LINE_RE = re.compile(r"^[^\S\n]*\[", re.MULTILINE)
+_JSON_DECODER = json.JSONDecoder()
+# Whitespace json.loads tolerates after a value
+_JSON_TRAILING_WS_RE = re.compile(r"[ \t\n\r]*")
+
+# Corrected Prompt 1 config staged for every run; encoded once at import
+_PROMPT1_TEST_CONFIG = b"""use_legacy_paths: true
+paths:
+  data_source: /srv/data/production/users.json
+  legacy_data_source: ./user_data.json
+  log_file: /var/log/processor.log
+validation_rules:
+  min_age_years: 21
+  minimum_posts: 5
+  required_fields:
+    - id
+    - first_name
+    - last_name
+    - contact.email"""
+
+
+# Fallback users staged for Prompt 1 when the repo test data has no usable shape
+_PROMPT1_CURATED_USERS = [
+    {
+        "id": "101",
+        "first_name": "Jane",
+        "last_name": "Doe",
+        "contact": {"email": "jane.doe@example.com"},
+        "profile": {"country": "USA"},
+        "stats": {"age": 28, "total_posts": 15},
+    },
+    {
+        "id": "102",
+        "first_name": "Emily",
+        "last_name": "White",
+        "contact": {"email": "emily.white@example.com"},
+        "profile": {"country": "USA"},
+        "stats": {"age": 25, "total_posts": 7},
+    },
+    {
+        "id": "103",
+        "first_name": "Lucas",
+        "last_name": "Martin",
+        "contact": {"email": "lucas@example.fr"},
+        "profile": {"country": "France"},
+        "stats": {"age": 30, "total_posts": 3},
+    },
+]
+_PROMPT1_CURATED_PAYLOAD = json.dumps({"users": _PROMPT1_CURATED_USERS}).encode()
+
+
+def _prompt1_users_payload(data: Any) -> bytes:
+    """Serialize the Prompt 1 ``user_data.json``, guaranteeing ``{"users": [...]}`` shape.
+
+    Repo test data is used when it has a usable shape; anything else falls
+    back to the curated set, which is serialized once at import.
+    """
+    if isinstance(data, dict) and isinstance(data.get("users"), list):
+        return json.dumps(data).encode()
+    if isinstance(data, list):
+        return json.dumps({"users": data}).encode()
+    return _PROMPT1_CURATED_PAYLOAD
+
+
+def _decode_json_tail(text: str, start: int) -> Any:
+    """``json.loads(text[start:])`` without copying the tail of ``text``.
+
+    Like ``json.loads``, only whitespace may follow the decoded value.
+    """
+    value, end = _JSON_DECODER.raw_decode(text, start)
+    end = _JSON_TRAILING_WS_RE.match(text, end).end()
+    if end != len(text):
+        raise json.JSONDecodeError("Extra data", text, end)
+    return value
+
+
+def _memoized_analysis(
+    analyze: Callable[[Any, str], dict[str, Any]],
+) -> Callable[[Any, str], dict[str, Any]]:
+    """Memoize an ``analyze_code_*`` classmethod per (analyzer class, source).
+
+    The analyses are pure functions of the source, so re-analyzing identical code
+    (retries, shared reference solutions) reuses the first result. Every call
+    still gets its own ``issues`` / ``all_issues`` containers to mutate.
+    """
+
+    @lru_cache(maxsize=64)
+    def cached(cls: Any, code: str) -> dict[str, Any]:
+        return analyze(cls, code)
+
+    @wraps(analyze)
+    def wrapper(cls: Any, code: str) -> dict[str, Any]:
+        result = cached(cls, code)
+        return {
+            **result,
+            "issues": {kind: list(found) for kind, found in result["issues"].items()},
+            "all_issues": list(result["all_issues"]),
+        }
+
+    return wrapper
+
+
 class SecurityAnalyzer:
     """Analyzes code for common security vulnerabilities."""
 
@@ -166,19 +315,13 @@ class SecurityAnalyzer:
         issues = []
 
         # String concatenation with SQL keywords
-        sql_concat_patterns = [
-            r'["\'].*\s*(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER)\s+.*["\'].*\+',
-            r'\+.*["\'].*\s*(WHERE|ORDER BY|GROUP BY|HAVING)\s+.*["\']',
-            r'f["\'].*\s*(SELECT|INSERT|UPDATE|DELETE)\s+.*\{.*\}.*["\']',
-        ]
-
-        for pattern in sql_concat_patterns:
-            if re.search(pattern, code, re.IGNORECASE):
+        for pattern in _SQL_CONCAT_RES:
+            if pattern.search(code):
                 issues.append(("sql_injection", "Potential SQL injection via string concatenation"))
                 break
 
         # Check for execute() without parameterization
-        if re.search(r'\.execute\(["\'].*\{.*\}.*["\']', code, re.IGNORECASE):
+        if _SQL_EXECUTE_FORMAT_RE.search(code):
             issues.append(("sql_injection", "SQL execute with string formatting"))
 
         return issues
@@ -188,19 +331,16 @@ class SecurityAnalyzer:
         """Check for hardcoded secrets and API keys."""
         issues = []
 
-        # Common secret patterns
-        secret_patterns = [
-            (r'password\s*=\s*["\'][^"\']{8,}["\']', "Hardcoded password"),
-            (r'api_key\s*=\s*["\'][^"\']{16,}["\']', "Hardcoded API key"),
-            (r'secret\s*=\s*["\'][^"\']{16,}["\']', "Hardcoded secret"),
-            (r'token\s*=\s*["\'][^"\']{20,}["\']', "Hardcoded token"),
-            (r'["\'][A-Za-z0-9+/]{40,}={0,2}["\']', "Potential base64 encoded secret"),
-            (r'["\']sk-[A-Za-z0-9]{32,}["\']', "OpenAI API key pattern"),
-            (r'["\']ghp_[A-Za-z0-9]{36}["\']', "GitHub personal access token"),
-        ]
+        # Lowercased code is only a safe prefilter when no case twin is present
+        lowered = None
+        if code.isascii() or not any(ch in code for ch in _ASCII_CASE_TWINS):
+            lowered = code.lower()
 
-        for pattern, description in secret_patterns:
-            if re.search(pattern, code, re.IGNORECASE):
+        # Common secret patterns
+        for literal, pattern, description in _SECRET_RES:
+            if literal is not None and lowered is not None and literal not in lowered:
+                continue
+            if pattern.search(code):
                 issues.append(("hardcoded_secret", description))
 
         return issues
@@ -211,7 +351,7 @@ class SecurityAnalyzer:
         issues = []
 
         # Direct path concatenation without validation
-        if re.search(r"open\s*\(\s*.*\+.*user.*\)", code, re.IGNORECASE):
+        if _OPEN_USER_CONCAT_RE.search(code):
             issues.append(("path_traversal", "Path concatenation with user input"))
 
         # Missing path validation
@@ -219,21 +359,15 @@ class SecurityAnalyzer:
             issues.append(("path_traversal", "Potential directory traversal pattern"))
 
         # Unsafe file operations
-        unsafe_patterns = [
-            r"os\.system\s*\(\s*.*user",
-            r"subprocess\..*shell=True.*user",
-            r"eval\s*\(\s*.*user",
-            r"exec\s*\(\s*.*user",
-        ]
-
-        for pattern in unsafe_patterns:
-            if re.search(pattern, code, re.IGNORECASE):
+        for pattern in _UNSAFE_EXEC_RES:
+            if pattern.search(code):
                 issues.append(("unsafe_execution", "Unsafe execution with user input"))
                 break
 
         return issues
 
     @classmethod
+    @_memoized_analysis
     def analyze_code_security(cls, code: str) -> dict[str, Any]:
         """Perform comprehensive security analysis on code."""
         all_issues = []
@@ -273,27 +407,43 @@ class SecurityAnalyzer:
         }
 
 
+def _occurs_twice(code: str, token: str) -> bool:
+    """Return True if ``token`` appears at least twice, scanning no further than needed."""
+    first = code.find(token)
+    return first >= 0 and code.find(token, first + len(token)) >= 0
+
+
+def _has_multiple_sorts(code: str) -> bool:
+    """Same test as ``code.count(".sort(") > 1 or code.count("sorted(") > 1``."""
+    return _occurs_twice(code, ".sort(") or _occurs_twice(code, "sorted(")
+
+
 class PerformanceAnalyzer:
-    """Analyzes code for performance issues and inefficient patterns."""
+    """Analyzes code for performance issues and inefficient patterns.
+
+    Line-based checks accept ``lines`` (``code.split("\\n")``) so one split is shared.
+    """
 
     @staticmethod
-    def check_nested_loops(code: str) -> list[tuple[str, str]]:
+    def check_nested_loops(code: str, *, lines: list[str] | None = None) -> list[tuple[str, str]]:
         """Check for O(n²) and nested loop patterns that may be inefficient."""
         issues = []
 
         # Simple check for nested for loops
-        lines = code.split("\n")
+        if lines is None:
+            lines = code.split("\n")
         for i, line in enumerate(lines):
-            if re.search(r"^\s*for\s+\w+\s+in\s+", line.strip()):
+            if _FOR_IN_RE.search(line.strip()):
                 # Look for another for loop in the next few lines (within same indentation block)
                 base_indent = len(line) - len(line.lstrip())
                 for j in range(i + 1, min(i + 10, len(lines))):
-                    if lines[j].strip() == "":
+                    # One lstrip serves both the blank-line test and the indent width
+                    body = lines[j].lstrip()
+                    if not body:
                         continue
-                    current_indent = len(lines[j]) - len(lines[j].lstrip())
-                    if current_indent <= base_indent:
+                    if len(lines[j]) - len(body) <= base_indent:
                         break
-                    if re.search(r"^\s*for\s+\w+\s+in\s+", lines[j].strip()):
+                    if _FOR_IN_RE.search(body.rstrip()):
                         issues.append(
                             ("nested_loops", "Potential O(n²) nested loop pattern detected")
                         )
@@ -302,16 +452,19 @@ class PerformanceAnalyzer:
         return issues
 
     @staticmethod
-    def check_inefficient_patterns(code: str) -> list[tuple[str, str]]:
+    def check_inefficient_patterns(
+        code: str, *, lines: list[str] | None = None
+    ) -> list[tuple[str, str]]:
         """Check for common inefficient programming patterns."""
         issues = []
 
         # Repeated string concatenation in loops (simplified check)
         if "for " in code and "+=" in code and ("str(" in code or '"' in code or "'" in code):
-            lines = code.split("\n")
+            if lines is None:
+                lines = code.split("\n")
             in_loop = False
             for line in lines:
-                is_for_loop = re.match(r"\s*for\s+", line) is not None
+                is_for_loop = _FOR_RE.match(line) is not None
                 if is_for_loop:
                     in_loop = True
                 elif in_loop and "+=" in line and ('"' in line or "'" in line):
@@ -326,11 +479,11 @@ class PerformanceAnalyzer:
                     in_loop = False
 
         # Inefficient membership testing
-        if re.search(r"if\s+.*\s+in\s+\[.*\]:", code) is not None:
+        if _LIST_MEMBERSHIP_RE.search(code) is not None:
             issues.append(("list_membership", "Use set for membership testing instead of list"))
 
         # Multiple sorts
-        multiple_sorts = (code.count(".sort(") > 1) or (code.count("sorted(") > 1)
+        multiple_sorts = _has_multiple_sorts(code)
         if multiple_sorts:
             issues.append(("multiple_sorts", "Multiple sorts detected - consider single sort"))
 
@@ -365,7 +518,7 @@ class PerformanceAnalyzer:
             issues.append(("linear_search", "Consider binary search for sorted data"))
 
         # Inefficient sorting
-        if code.count(".sort(") > 1 or code.count("sorted(") > 1:
+        if _has_multiple_sorts(code):
             issues.append(("multiple_sorts", "Multiple sorts detected - consider single sort"))
 
         # Unnecessary data structure conversions
@@ -375,12 +528,15 @@ class PerformanceAnalyzer:
         return issues
 
     @classmethod
+    @_memoized_analysis
     def analyze_code_performance(cls, code: str) -> dict[str, Any]:
         """Perform comprehensive performance analysis on code."""
         all_issues = []
 
-        all_issues.extend(cls.check_nested_loops(code))
-        all_issues.extend(cls.check_inefficient_patterns(code))
+        # Split once for every line-based check
+        lines = code.split("\n")
+        all_issues.extend(cls.check_nested_loops(code, lines=lines))
+        all_issues.extend(cls.check_inefficient_patterns(code, lines=lines))
         all_issues.extend(cls.check_memory_patterns(code))
         all_issues.extend(cls.check_algorithm_efficiency(code))
 
@@ -424,21 +580,27 @@ class PerformanceAnalyzer:
 
 
 class MaintainabilityAnalyzer:
-    """Analyzes code for maintainability issues and code quality metrics."""
+    """Analyzes code for maintainability issues and code quality metrics.
+
+    Line-based checks accept ``lines`` (``code.split("\\n")``) so one split is shared.
+    """
 
     @staticmethod
-    def check_function_length(code: str) -> list[tuple[str, str]]:
+    def check_function_length(
+        code: str, *, lines: list[str] | None = None
+    ) -> list[tuple[str, str]]:
         """Check for overly long functions (>20 lines)."""
         issues = []
 
-        lines = code.split("\n")
+        if lines is None:
+            lines = code.split("\n")
         in_function = False
         function_start = 0
         function_name = ""
 
         for i, line in enumerate(lines):
             # Check for function definition
-            func_match = re.match(r"\s*def\s+(\w+)\s*\(", line)
+            func_match = _DEF_RE.match(line)
             is_function_def = func_match is not None
 
             if is_function_def:
@@ -488,24 +650,29 @@ class MaintainabilityAnalyzer:
         return issues
 
     @staticmethod
-    def check_code_duplication(code: str) -> list[tuple[str, str]]:
+    def check_code_duplication(
+        code: str, *, lines: list[str] | None = None
+    ) -> list[tuple[str, str]]:
         """Check for obvious code duplication patterns."""
         issues = []
 
-        lines = [line.strip() for line in code.split("\n") if line.strip()]
+        if lines is None:
+            lines = code.split("\n")
+        lines = [line.strip() for line in lines if line.strip()]
 
-        # Look for repeated blocks of 3+ lines
+        # Look for repeated blocks of 3+ lines: index each block by its first
+        # position and report once a non-overlapping repeat shows up.
+        # Skip very short or comment lines
+        eligible = [len(line) >= 10 and not line.startswith("#") for line in lines]
+        first_seen: dict[tuple[str, str, str], int] = {}
         for i in range(len(lines) - 2):
-            block = lines[i : i + 3]
-            # Skip very short or comment lines
-            if any(len(line) < 10 or line.startswith("#") for line in block):
+            if not (eligible[i] and eligible[i + 1] and eligible[i + 2]):
                 continue
-
-            # Look for same block later in code
-            for j in range(i + 3, len(lines) - 2):
-                if lines[j : j + 3] == block:
-                    issues.append(("code_duplication", "Repeated code block detected"))
-                    return issues  # Only report once
+            block = (lines[i], lines[i + 1], lines[i + 2])
+            first = first_seen.setdefault(block, i)
+            if i - first >= 3:
+                issues.append(("code_duplication", "Repeated code block detected"))
+                return issues  # Only report once
 
         return issues
 
@@ -515,7 +682,7 @@ class MaintainabilityAnalyzer:
         issues = []
 
         # Check for single letter variables (except common ones like i, j in loops)
-        single_letter_vars = re.findall(r"\b[a-z]\s*=", code)
+        single_letter_vars = _SINGLE_LETTER_ASSIGN_RE.findall(code)
         loop_context_vars = ["i", "j", "k", "x", "y", "z"]
 
         problematic_vars = [var[0] for var in single_letter_vars if var[0] not in loop_context_vars]
@@ -526,19 +693,22 @@ class MaintainabilityAnalyzer:
             )
 
         # Check for variables with numbers (often indicates poor naming)
-        numbered_vars = re.findall(r"\b\w*\d+\w*\s*=", code)
+        numbered_vars = _NUMBERED_ASSIGN_RE.findall(code)
         if len(numbered_vars) > 2:  # Allow some numbered variables
             issues.append(("numbered_variables", "Multiple numbered variables suggest poor naming"))
 
         return issues
 
     @staticmethod
-    def check_complexity_indicators(code: str) -> list[tuple[str, str]]:
+    def check_complexity_indicators(
+        code: str, *, lines: list[str] | None = None
+    ) -> list[tuple[str, str]]:
         """Check for high complexity indicators."""
         issues = []
 
         # Count nested if statements (simplified complexity measure)
-        lines = code.split("\n")
+        if lines is None:
+            lines = code.split("\n")
         max_if_depth = 0
         current_if_depth = 0
 
@@ -554,21 +724,24 @@ class MaintainabilityAnalyzer:
             )
 
         # Count number of conditions in single if statements
-        complex_ifs = re.findall(r"if\s+.*\sand\s.*\sand\s", code)
+        complex_ifs = _COMPLEX_IF_RE.findall(code)
         if complex_ifs:
             issues.append(("complex_conditions", "Complex boolean conditions found"))
 
         return issues
 
     @classmethod
+    @_memoized_analysis
     def analyze_code_maintainability(cls, code: str) -> dict[str, Any]:
         """Perform comprehensive maintainability analysis on code."""
         all_issues = []
 
-        all_issues.extend(cls.check_function_length(code))
-        all_issues.extend(cls.check_code_duplication(code))
+        # Split once for every line-based check
+        lines = code.split("\n")
+        all_issues.extend(cls.check_function_length(code, lines=lines))
+        all_issues.extend(cls.check_code_duplication(code, lines=lines))
         all_issues.extend(cls.check_variable_naming(code))
-        all_issues.extend(cls.check_complexity_indicators(code))
+        all_issues.extend(cls.check_complexity_indicators(code, lines=lines))
 
         # Calculate maintainability score
         maintainability_score = 2.0  # Start with max maintainability score
@@ -716,66 +889,10 @@ class PromptValidators:
                 test_data = Path(tmpdir) / "user_data.json"
 
                 # Write corrected config for testing
-                corrected_config = """use_legacy_paths: true
-paths:
-  data_source: /srv/data/production/users.json
-  legacy_data_source: ./user_data.json
-  log_file: /var/log/processor.log
-validation_rules:
-  min_age_years: 21
-  minimum_posts: 5
-  required_fields:
-    - id
-    - first_name
-    - last_name
-    - contact.email"""
-
-                with open(test_config, "w") as f:
-                    f.write(corrected_config)
+                test_config.write_bytes(_PROMPT1_TEST_CONFIG)
 
                 # Always provide a deterministic, schema-correct dataset for Prompt 1
-                curated_users = [
-                    {
-                        "id": "101",
-                        "first_name": "Jane",
-                        "last_name": "Doe",
-                        "contact": {"email": "jane.doe@example.com"},
-                        "profile": {"country": "USA"},
-                        "stats": {"age": 28, "total_posts": 15},
-                    },
-                    {
-                        "id": "102",
-                        "first_name": "Emily",
-                        "last_name": "White",
-                        "contact": {"email": "emily.white@example.com"},
-                        "profile": {"country": "USA"},
-                        "stats": {"age": 25, "total_posts": 7},
-                    },
-                    {
-                        "id": "103",
-                        "first_name": "Lucas",
-                        "last_name": "Martin",
-                        "contact": {"email": "lucas@example.fr"},
-                        "profile": {"country": "France"},
-                        "stats": {"age": 30, "total_posts": 3},
-                    },
-                ]
-
-                def _coerce_users_payload(data: Any) -> dict[str, Any]:
-                    # Accept repo test data if present, but guarantee {"users": [...]} shape
-                    if data is None:
-                        return {"users": curated_users}
-                    if isinstance(data, dict) and isinstance(data.get("users"), list):
-                        return data
-                    if isinstance(data, list):
-                        return {"users": data}
-                    # Anything else: fall back to deterministic set
-                    return {"users": curated_users}
-
-                payload = _coerce_users_payload(self.user_data)
-
-                with open(test_data, "w", encoding="utf-8") as f:
-                    json.dump(payload, f)
+                test_data.write_bytes(_prompt1_users_payload(self.user_data))
 
                 import subprocess
                 import sys
@@ -807,34 +924,36 @@ validation_rules:
                             # pretty-printed)
                             try:
                                 # Skip the "Processed Records:" line and try to parse the rest
-                                lines = output.strip().split("\n")
-                                json_start_line = None
-                                for i, line in enumerate(lines):
-                                    if line.strip().startswith("["):
-                                        json_start_line = i
-                                        break
-
-                                if json_start_line is not None:
-                                    # Join all lines from the JSON start to form complete JSON
-                                    json_content = "\n".join(lines[json_start_line:]).strip()
-                                    output_data = json.loads(json_content)
+                                text = output.strip()
+                                json_start = _JSON_ARRAY_LINE_RE.search(text)
+
+                                if json_start is not None:
+                                    # Decode in place from the "[" to the end of the output
+                                    output_data = _decode_json_tail(text, json_start.end() - 1)
                                     json_parsed = True
 
                                     # Validate JSON structure
                                     if isinstance(output_data, list):
                                         # Check if output contains expected USA users (Jane, Emily)
-                                        jane_found = any(
-                                            "Jane" in str(user.get("full_name", ""))
-                                            or "Jane" in str(user.get("first_name", ""))
-                                            for user in output_data
-                                            if isinstance(user, dict)
-                                        )
-                                        emily_found = any(
-                                            "Emily" in str(user.get("full_name", ""))
-                                            or "Emily" in str(user.get("first_name", ""))
-                                            for user in output_data
-                                            if isinstance(user, dict)
-                                        )
+                                        # in one pass, stopping once both are seen
+                                        jane_found = emily_found = False
+                                        for user in output_data:
+                                            if not isinstance(user, dict):
+                                                continue
+                                            full_name = str(user.get("full_name", ""))
+                                            first_name = str(user.get("first_name", ""))
+                                            jane_found = (
+                                                jane_found
+                                                or "Jane" in full_name
+                                                or "Jane" in first_name
+                                            )
+                                            emily_found = (
+                                                emily_found
+                                                or "Emily" in full_name
+                                                or "Emily" in first_name
+                                            )
+                                            if jane_found and emily_found:
+                                                break
 
                                         if jane_found and emily_found:
                                             execution_scoring.add_check(
@@ -874,7 +993,7 @@ validation_rules:
                                         )
                             except json.JSONDecodeError:
                                 # Try single line parsing as fallback
-                                for line in lines:
+                                for line in text.split("\n"):
                                     if line.strip().startswith("[") or line.strip().startswith("{"):
                                         try:
                                             output_data = json.loads(line.strip())
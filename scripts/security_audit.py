@@ -268,7 +268,7 @@ def check_filesystem_bounds() -> CheckResult:
     has_path_guard = "guarded_open" in sr and "_check_path_or_raise" in sr
     has_comprehensive = all(
         guard in sr
-        for guard in ["guarded_shutil_copy", "guarded_os_remove", "guarded_shutil_rmtree"]
+        for guard in ["sys.addaudithook(_audit_guard)", "'shutil.copyfile'", "'os.remove'"]
     )
     if has_path_guard and has_comprehensive:
         return CheckResult(
@@ -323,7 +323,7 @@ def check_dynamic_code_block() -> CheckResult:
 def check_dangerous_imports_block() -> CheckResult:
     sr = _read_secure_runner()
     has_import_guard = "builtins.__import__ = _protected_import" in sr
-    has_dangerous_check = "dangerous_modules = {" in sr and "'ctypes'" in sr
+    has_dangerous_check = "dangerous_modules = frozenset({" in sr and "'ctypes'" in sr
 
     if has_import_guard and has_dangerous_check:
         return CheckResult("Dangerous imports block", "PASS", "dangerous imports blocked", True)
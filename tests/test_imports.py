@@ -1,6 +1,8 @@
 # SPDX-FileCopyrightText: 2024-2025 sMiNT0S
 # SPDX-License-Identifier: Apache-2.0
 import importlib
+import subprocess
+import sys
 
 
 def test_imports_smoke():
@@ -14,3 +16,13 @@ def test_imports_smoke():
         "benchmark.validators",
     ]:
         importlib.import_module(mod)
+
+
+def test_benchmark_package_defers_validators_import():
+    """Touching a light helper must not pull in the validators module."""
+    code = (
+        "import sys, benchmark; benchmark.ensure_directories; "
+        "assert 'benchmark.validators' not in sys.modules; "
+        "benchmark.PromptValidators; assert 'benchmark.validators' in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -9,10 +9,13 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
+import subprocess
+import sys
 import time
 
 import pytest
 
+from benchmark import platform_validator as pv
 from benchmark.platform_validator import CURRENT_PLATFORM, PlatformBenchmarkValidator
 
 
@@ -49,6 +52,14 @@ def test_extract_scores_rounding(validator: PlatformBenchmarkValidator):
     assert scores == {"prompt_1": 12.35, "prompt_2": 7.9}
 
 
+@pytest.mark.unit
+def test_extract_scores_reflects_mutated_results(validator: PlatformBenchmarkValidator):
+    results = _sample_benchmark_results("m1", {"prompt_1": 1.0})
+    assert validator.extract_scores(results) == {"prompt_1": 1.0}
+    results["results"]["models"]["m1"]["prompts"]["prompt_1"]["score"] = 2.0
+    assert validator.extract_scores(results) == {"prompt_1": 2.0}
+
+
 @pytest.mark.unit
 def test_compare_insufficient_data(validator: PlatformBenchmarkValidator):
     comparison = validator.compare_results([_sample_benchmark_results("m", {"prompt_1": 1.0})])
@@ -91,3 +102,74 @@ def test_save_results_writes_file(validator: PlatformBenchmarkValidator, temp_di
     assert path.exists()
     loaded = json.loads(path.read_text(encoding="utf-8"))
     assert loaded["status"] == "ok"
+
+
+@pytest.mark.unit
+def test_safe_print_batches_non_interactive_output(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+):
+    monkeypatch.setattr(pv, "_STDOUT_IS_TTY", False)
+    pv.safe_print("line one")
+    pv.safe_print("line two")
+    assert capsys.readouterr().out == ""
+    pv.flush_output()
+    assert capsys.readouterr().out == "line one\nline two\n"
+
+
+@pytest.mark.unit
+def test_validation_flushes_verdict_without_waiting_for_exit(
+    validator: PlatformBenchmarkValidator,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+):
+    monkeypatch.setattr(pv, "_STDOUT_IS_TTY", False)
+
+    def _crash(model_name: str) -> dict:
+        raise RuntimeError("runner cancelled")
+
+    monkeypatch.setattr(validator, "run_single_benchmark", _crash)
+    result = validator.validate_example_model()
+    assert result["status"] == "error"
+    assert capsys.readouterr().out.splitlines() == [
+        "Starting platform validation for example_model",
+        "Platform validation ERROR: runner cancelled",
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+def test_run_capturing_timeout_is_not_held_up_by_grandchild(temp_dir: Path):
+    # The grandchild inherits stdout/stderr and outlives the timed-out child
+    script = (
+        "import subprocess, sys, time; "
+        "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']); "
+        "time.sleep(60)"
+    )
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        pv._run_capturing([sys.executable, "-c", script], cwd=temp_dir, timeout=1)
+    assert time.monotonic() - start < 1 + pv._READER_GRACE + 2
+
+
+@pytest.mark.unit
+def test_run_capturing_kills_child_when_wait_is_interrupted(
+    temp_dir: Path, monkeypatch: pytest.MonkeyPatch
+):
+    started: list[subprocess.Popen[bytes]] = []
+
+    class _InterruptedPopen(subprocess.Popen):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            started.append(self)
+
+        def wait(self, timeout=None):
+            if timeout is not None:
+                raise KeyboardInterrupt  # Ctrl-C while waiting on the benchmark
+            return super().wait()
+
+    monkeypatch.setattr(pv.subprocess, "Popen", _InterruptedPopen)
+    with pytest.raises(KeyboardInterrupt):
+        pv._run_capturing(
+            [sys.executable, "-c", "import time; time.sleep(60)"], cwd=temp_dir, timeout=30
+        )
+    assert started[0].poll() is not None  # killed and reaped, not left running
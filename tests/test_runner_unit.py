@@ -78,3 +78,41 @@ def test_setup_and_cleanup_environment(runner: TestRunner, temp_dir: Path, test_
     runner.cleanup_test_environment(temp_dir)
     # user_data.json may be removed; tolerate both states (cleanup ignores errors)
     assert True  # No exception means success
+
+
+@pytest.mark.unit
+def test_setup_environment_is_idempotent_and_tolerates_missing_source(temp_dir: Path):
+    src_dir = temp_dir / "src"
+    dst_dir = temp_dir / "dst"
+    src_dir.mkdir()
+    dst_dir.mkdir()
+
+    # Missing source: nothing staged, no error
+    TestRunner(src_dir).setup_test_environment(dst_dir)
+    assert not (dst_dir / "user_data.json").exists()
+
+    (src_dir / "user_data.json").write_text("[]", encoding="utf-8")
+    runner = TestRunner(src_dir)
+    runner.setup_test_environment(dst_dir)
+    runner.setup_test_environment(dst_dir)  # already present -> no error
+    staged = dst_dir / "user_data.json"
+    assert staged.read_text(encoding="utf-8") == "[]"
+    # A separate file: writes in the run directory never reach the fixture
+    assert staged.stat().st_ino != (src_dir / "user_data.json").stat().st_ino
+    staged.write_text("corrupted", encoding="utf-8")
+    assert (src_dir / "user_data.json").read_text(encoding="utf-8") == "[]"
+
+    with pytest.raises(FileNotFoundError):
+        runner.setup_test_environment(temp_dir / "missing")
+
+
+@pytest.mark.unit
+def test_run_python_script_sees_current_environment(
+    runner: TestRunner, temp_dir: Path, monkeypatch: pytest.MonkeyPatch
+):
+    script = temp_dir / "env_probe.py"
+    script.write_text("import os\nprint(os.environ.get('AIB_UNIT_PROBE'))\n", newline="\n")
+    monkeypatch.setenv("AIB_UNIT_PROBE", "first")
+    assert runner.run_python_script(script)["stdout"].strip() == "first"
+    monkeypatch.setenv("AIB_UNIT_PROBE", "second")
+    assert runner.run_python_script(script)["stdout"].strip() == "second"
@@ -0,0 +1,345 @@
+# SPDX-FileCopyrightText: 2024-2025 sMiNT0S
+# SPDX-License-Identifier: Apache-2.0
+"""Unit tests for `benchmark.secure_runner.SecureRunner` execution helpers."""
+
+from __future__ import annotations
+
+import importlib.util
+import marshal
+import os
+from pathlib import Path
+
+import pytest
+
+from benchmark import secure_runner
+from benchmark.secure_runner import SecureRunner, _clone_file
+
+
+def _add(a: int, b: int) -> int:
+    return a + b
+
+
+def _boom() -> None:
+    raise ValueError("boom")
+
+
+def _die() -> None:
+    os._exit(3)
+
+
+def _exit() -> None:
+    raise SystemExit(0)
+
+
+@pytest.fixture
+def runner() -> SecureRunner:
+    return SecureRunner("unit_model")
+
+
+@pytest.mark.unit
+def test_run_with_limits_returns_result(runner: SecureRunner):
+    assert runner.run_with_limits(_add, 2, 3, timeout=10) == 5
+
+
+@pytest.mark.unit
+def test_run_with_limits_wraps_child_errors(runner: SecureRunner):
+    with pytest.raises(RuntimeError, match="ValueError: boom"):
+        runner.run_with_limits(_boom, timeout=10)
+
+
+@pytest.mark.unit
+def test_run_with_limits_reports_missing_result(runner: SecureRunner):
+    with pytest.raises(RuntimeError, match="ended without result"):
+        runner.run_with_limits(_die, timeout=10)
+
+
+@pytest.mark.unit
+def test_run_with_limits_contains_system_exit(runner: SecureRunner):
+    with pytest.raises(RuntimeError, match="ended without result"):
+        runner.run_with_limits(_exit, timeout=10)
+    assert runner.run_with_limits(_add, 1, 1, timeout=10) == 2  # parent unaffected
+
+
+@pytest.mark.unit
+def test_sandbox_restores_cwd_and_environment(monkeypatch):
+    monkeypatch.setenv("AIBUGBENCH_UNIT_MARKER", "parent-only")
+    runner = SecureRunner("unit_model")
+    cwd_before = Path.cwd()
+    with runner.sandbox() as sb:
+        assert Path.cwd() == sb.resolve()
+        assert "AIBUGBENCH_UNIT_MARKER" not in os.environ
+        assert os.environ["AIBUGBENCH_SANDBOX_ROOT"] == str(sb.resolve())
+    assert Path.cwd() == cwd_before
+    assert os.environ["AIBUGBENCH_UNIT_MARKER"] == "parent-only"
+    assert not sb.exists()
+
+
+@pytest.mark.unit
+def test_clone_file_copies_independently(tmp_path: Path):
+    src = tmp_path / "src.json"
+    dst = tmp_path / "dst.json"
+    src.write_text('{"users": []}', encoding="utf-8")
+    _clone_file(str(src), str(dst))
+    assert dst.read_text(encoding="utf-8") == '{"users": []}'
+    dst.write_text("changed", encoding="utf-8")
+    assert src.read_text(encoding="utf-8") == '{"users": []}'
+
+
+@pytest.mark.unit
+def test_clone_file_handles_multi_chunk_files(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(secure_runner, "_COPY_CHUNK", 7)
+    src = tmp_path / "big.bin"
+    dst = tmp_path / "big_copy.bin"
+    payload = bytes(range(256)) * 3
+    src.write_bytes(payload)
+    _clone_file(str(src), str(dst))
+    assert dst.read_bytes() == payload
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(secure_runner.resource is None, reason="POSIX rlimits only")
+def test_run_python_sandboxed_applies_rlimits_in_preexec(runner: SecureRunner, monkeypatch):
+    real_run = secure_runner.subprocess.run
+    preexec_fns: list[object] = []
+
+    def _spy(*args, **kwargs):
+        preexec_fns.append(kwargs.get("preexec_fn"))
+        return real_run(*args, **kwargs)
+
+    monkeypatch.setattr(secure_runner.subprocess, "run", _spy)
+    code = (
+        "import resource; "
+        "print(resource.getrlimit(resource.RLIMIT_FSIZE)[0], "
+        "resource.getrlimit(resource.RLIMIT_CPU)[0])"
+    )
+    with runner.sandbox() as sb:
+        guarded = runner.run_python_sandboxed(["-c", code], cwd=sb)
+        unguarded = runner.run_python_sandboxed(["-I", "-c", code], cwd=sb)
+    assert guarded.stdout.split() == [str(10 * 1024 * 1024), "10"]
+    assert unguarded.stdout.split() == [str(10 * 1024 * 1024), "10"]
+    # Limits never depend on the guard loading
+    assert all(fn is not None for fn in preexec_fns)
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(secure_runner.resource is None, reason="POSIX rlimits only")
+def test_planted_guard_bytecode_is_replaced_before_each_run(runner: SecureRunner):
+    # Unchecked hash-based pyc: the importer would load it without looking at the source
+    planted = b"".join(
+        [
+            importlib.util.MAGIC_NUMBER,
+            (0b01).to_bytes(4, "little"),
+            b"\0" * 8,
+            marshal.dumps(compile("print('planted')", "sitecustomize.py", "exec")),
+        ]
+    )
+    probe = (
+        "import resource, socket; "
+        "print(resource.getrlimit(resource.RLIMIT_AS)[0] > 0, "
+        "socket.socket.__name__ == '_network_blocked')"
+    )
+    with runner.sandbox() as sb:
+        runner.run_python_sandboxed(["-c", "pass"], cwd=sb)
+        (sb / "__pycache__" / secure_runner._GUARD_PYC_NAME).write_bytes(planted)
+        (sb / "sitecustomize").mkdir()  # a package would shadow the module
+        (sb / "sitecustomize" / "__init__.py").write_text("print('planted')\n")
+        proc = runner.run_python_sandboxed(["-c", probe], cwd=sb)
+    assert proc.stdout.split() == ["True", "True"], proc.stdout
+
+
+@pytest.mark.unit
+def test_sandbox_trees_are_discarded_in_batches(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(secure_runner, "_DISCARD_BATCH", 2)
+    monkeypatch.setattr(secure_runner, "_discarded", [])
+    first, second = tmp_path / "aibugbench_a", tmp_path / "aibugbench_b"
+    for tree in (first, second):
+        (tree / "sandbox").mkdir(parents=True)
+
+    secure_runner._discard_tree(first)
+    assert not first.exists()
+    assert (tmp_path / "aibugbench_a.discard").exists()  # deletion deferred
+
+    secure_runner._discard_tree(second)
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.unit
+def test_sandbox_trees_on_shm_are_removed_immediately(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(secure_runner, "_SANDBOX_TMP_ROOT", str(tmp_path))
+    monkeypatch.setattr(secure_runner, "_discarded", [])
+    tree = tmp_path / "aibugbench_a"
+    (tree / "sandbox").mkdir(parents=True)
+
+    secure_runner._discard_tree(tree)
+    assert list(tmp_path.iterdir()) == []
+    assert secure_runner._discarded == []
+
+
+@pytest.mark.unit
+def test_guard_audit_hook_confines_filesystem_mutations(runner: SecureRunner, tmp_path: Path):
+    outside = tmp_path / "outside.txt"
+    outside.write_text("keep", encoding="utf-8")
+    script = "\n".join(
+        [
+            "import os, shutil",
+            "os.makedirs('scratch/nested')",
+            "open('scratch/nested/f.txt', 'w').close()",
+            "shutil.rmtree('scratch')",
+            "print('inside', os.path.exists('scratch'))",
+            "for op in (os.remove, os.unlink):",
+            "    try:",
+            f"        op({str(outside)!r})",
+            "    except RuntimeError as exc:",
+            "        print('denied', exc)",
+            "try:",
+            f"    os.rename({str(outside)!r}, 'stolen.txt')",
+            "except RuntimeError:",
+            "    print('denied rename')",
+        ]
+    )
+    with runner.sandbox() as sb:
+        (sb / "mutate.py").write_text(script, encoding="utf-8")
+        proc = runner.run_python_sandboxed(["mutate.py"], cwd=sb)
+    lines = proc.stdout.splitlines()
+    assert lines[0] == "inside False", proc.stdout
+    assert [line.split(" ", 2)[:2] for line in lines[1:3]] == [["denied", "filesystem"]] * 2
+    assert lines[3] == "denied rename"
+    assert outside.read_text(encoding="utf-8") == "keep"
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not hasattr(os, "fwalk"), reason="os.fwalk is POSIX only")
+def test_guard_audit_hook_allows_fwalk_inside_sandbox(runner: SecureRunner, tmp_path: Path):
+    script = "\n".join(
+        [
+            "import os",
+            "os.makedirs('tree/sub')",
+            "print(sorted(d for d, _, _, _ in os.fwalk('tree')))",
+            "try:",
+            f"    list(os.fwalk({str(tmp_path)!r}))",
+            "except RuntimeError:",
+            "    print('denied')",
+        ]
+    )
+    with runner.sandbox() as sb:
+        (sb / "walk.py").write_text(script, encoding="utf-8")
+        proc = runner.run_python_sandboxed(["walk.py"], cwd=sb)
+    assert proc.stdout.splitlines() == ["['tree', 'tree/sub']", "denied"], proc.stdout
+
+
+@pytest.mark.unit
+def test_sandbox_ships_checked_guard_bytecode(runner: SecureRunner):
+    with runner.sandbox() as sb:
+        assert not (sb / "sitecustomize.py").exists()  # written on first use
+        runner.run_python_sandboxed(["-c", "pass"], cwd=sb)
+        source = (sb / "sitecustomize.py").read_bytes()
+        pyc = (sb / "__pycache__" / secure_runner._GUARD_PYC_NAME).read_bytes()
+    assert pyc[:4] == importlib.util.MAGIC_NUMBER
+    assert int.from_bytes(pyc[4:8], "little") == 0b11  # hash-based, checked
+    assert pyc[8:16] == importlib.util.source_hash(source)
+
+
+@pytest.mark.unit
+def test_sandbox_restores_environment_as_of_entry(monkeypatch):
+    monkeypatch.setenv("LANG", "C.UTF-8")
+    runner = SecureRunner("unit_model")
+    monkeypatch.setenv("AIBUGBENCH_UNIT_LATE", "set-after-init")
+    with runner.sandbox():
+        assert os.environ["LANG"] == "C.UTF-8"
+        assert "AIBUGBENCH_UNIT_LATE" not in os.environ
+    assert os.environ["AIBUGBENCH_UNIT_LATE"] == "set-after-init"
+
+
+@pytest.mark.unit
+def test_sandbox_result_decodes_output_lazily():
+    result = secure_runner.SandboxResult(["python"], 0, b"ok\r\nbad \xff\r")
+    assert "stdout" not in vars(result)
+    assert b"ok" in result.stdout_bytes
+    assert result.stdout == "ok\nbad �\n"
+    assert result.stdout is result.stdout  # decoded once, then cached
+
+
+def _spin_swallowing_errors() -> None:
+    while True:
+        try:
+            sum(range(1000))
+        except Exception:  # noqa: S112 - must not hide the CPU budget
+            continue
+
+
+@pytest.mark.unit
+def test_run_inprocess_requires_trust_and_matches_error_contract(runner: SecureRunner):
+    assert runner.run_inprocess(_add, 2, 3, trusted=True) == 5
+    assert runner.run_inprocess(_add, 2, 3) == 5  # untrusted -> run_with_limits
+    with pytest.raises(RuntimeError, match="ValueError: boom"):
+        runner.run_inprocess(_boom, trusted=True)
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+@pytest.mark.skipif(not hasattr(secure_runner.signal, "setitimer"), reason="POSIX timers only")
+def test_run_inprocess_enforces_cpu_budget(runner: SecureRunner):
+    with pytest.raises(TimeoutError, match="exceeded 1s"):
+        runner.run_inprocess(_spin_swallowing_errors, timeout=1, trusted=True)
+
+
+@pytest.mark.unit
+def test_sandboxed_child_loads_guard_bytecode_despite_dash_b(runner: SecureRunner):
+    # -B / PYTHONDONTWRITEBYTECODE only stop writing bytecode; reading still works
+    with runner.sandbox() as sb:
+        os.environ["PYTHONVERBOSE"] = "1"  # sandbox env is restored on exit
+        proc = runner.run_python_sandboxed(["-c", "pass"], cwd=sb)
+    pyc = f"{secure_runner._GUARD_PYC_NAME} matches "
+    assert any(pyc in line and "sitecustomize.py" in line for line in proc.stdout.splitlines())
+
+
+@pytest.mark.unit
+def test_sandbox_skips_cache_and_vcs_debris(tmp_path: Path, monkeypatch):
+    submission = tmp_path / "submissions" / "unit_model"
+    (submission / "__pycache__").mkdir(parents=True)
+    (submission / ".git").mkdir()
+    (submission / "prompt_1_solution.py").write_text("print('hi')\n", encoding="utf-8")
+    (submission / "stale.pyc").write_bytes(b"\0")
+    (submission / "__pycache__" / "x.pyc").write_bytes(b"\0")
+    monkeypatch.chdir(tmp_path)
+    with SecureRunner("unit_model").sandbox() as sb:
+        copied = sorted(p.name for p in (sb / "submission").iterdir())
+    assert copied == ["prompt_1_solution.py"]
+
+
+@pytest.mark.unit
+def test_guard_path_check_rejects_prefix_siblings(runner: SecureRunner):
+    script = "\n".join(
+        [
+            "import os",
+            "root = os.environ['AIBUGBENCH_SANDBOX_ROOT']",
+            "open(os.path.join(root, 'inside.txt'), 'w').close()",
+            "for path in (root + '_sibling', os.path.join(root, '..', 'escape.txt')):",
+            "    try:",
+            "        open(path, 'w')",
+            "    except RuntimeError:",
+            "        print('denied')",
+        ]
+    )
+    with runner.sandbox() as sb:
+        (sb / "paths.py").write_text(script, encoding="utf-8")
+        proc = runner.run_python_sandboxed(["paths.py"], cwd=sb)
+        assert (sb / "inside.txt").exists()
+        assert not Path(f"{sb}_sibling").exists()
+    assert proc.stdout.split() == ["denied", "denied"], proc.stdout
+
+
+@pytest.mark.unit
+def test_sandbox_tmp_root_respects_explicit_tmpdir(monkeypatch):
+    monkeypatch.setenv("TMPDIR", "/somewhere/else")
+    assert secure_runner._sandbox_tmp_root() is None
+    monkeypatch.delenv("TMPDIR")
+    monkeypatch.setattr(secure_runner, "_SHM_MIN_FREE", float("inf"))
+    assert secure_runner._sandbox_tmp_root() is None  # too small: stay on disk
+
+
+@pytest.mark.unit
+def test_is_sensitive_env_matches_patterns_case_insensitively():
+    assert secure_runner.is_sensitive_env("OPENAI_API_KEY")
+    assert secure_runner.is_sensitive_env("db_password")
+    assert not secure_runner.is_sensitive_env("PATH")
@@ -87,3 +87,58 @@ def test_generate_comparison_chart(temp_dir: Path):
     content = out.read_text(encoding="utf-8")
     assert "COMPARISON CHART" in content
     assert "m1" in content and "m2" in content
+
+
+@pytest.mark.unit
+def test_load_test_data_reads_utf8_and_normalises_newlines(temp_dir: Path):
+    (temp_dir / "user_data.json").write_bytes('[{"name": "Zoë"}]'.encode())
+    (temp_dir / "config.yaml").write_bytes(b"a: 1\r\nb: 2\r")
+    data = utils.load_test_data(temp_dir)
+    assert data["user_data"] == [{"name": "Zoë"}]
+    assert data["original_config"] == "a: 1\nb: 2\n"
+    assert "original_script" not in data
+
+
+@pytest.mark.unit
+def test_load_test_data_reuses_reads_until_file_changes(temp_dir: Path):
+    data_file = temp_dir / "user_data.json"
+    data_file.write_text('[{"id": 1}]', encoding="utf-8")
+    first = utils.load_test_data(temp_dir)
+    second = utils.load_test_data(temp_dir)
+    assert first == second
+    assert first["user_data"] is not second["user_data"]  # callers may mutate
+
+    data_file.write_text('[{"id": 1}, {"id": 2}]', encoding="utf-8")
+    assert len(utils.load_test_data(temp_dir)["user_data"]) == 2
+
+
+@pytest.mark.unit
+def test_generate_comparison_chart_clamps_bars(temp_dir: Path):
+    ranking = [{"model": "over", "percentage": 120.0}, {"model": "half", "percentage": 50.0}]
+    out = temp_dir / "chart.txt"
+    utils.generate_comparison_chart({"comparison": {"ranking": ranking}}, out)
+    rows = [line for line in out.read_text(encoding="utf-8").splitlines() if "%" in line]
+    assert rows[0].count("█") == 50
+    assert rows[1].count("█") == 25 and rows[1].count("░") == 25
+
+
+@pytest.mark.unit
+def test_validate_submission_structure_ignores_empty_and_non_files(temp_dir: Path):
+    model_dir = temp_dir / "model_z"
+    (model_dir / "prompt_3_transform.py").mkdir(parents=True)
+    (model_dir / "prompt_4_api_sync.py").write_text("", encoding="utf-8")
+    validation = utils.validate_submission_structure(model_dir)
+    assert validation["prompt_3_transform.py"] is False
+    assert validation["prompt_4_api_sync.py"] is False
+    assert not any(utils.validate_submission_structure(temp_dir / "missing").values())
+
+
+@pytest.mark.unit
+def test_create_submission_template_keeps_existing_files(temp_dir: Path):
+    template_dir = temp_dir / "templates" / "template"
+    template_dir.mkdir(parents=True)
+    (template_dir / "prompt_1_solution.py").write_text("mine\n", encoding="utf-8")
+    utils.create_submission_template(temp_dir)
+    assert (template_dir / "prompt_1_solution.py").read_text(encoding="utf-8") == "mine\n"
+    assert (template_dir / "README.md").exists()
+    assert (template_dir / "prompt_4_api_sync.py").read_text(encoding="utf-8").startswith("#")
@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: 2024-2025 sMiNT0S
+# SPDX-License-Identifier: Apache-2.0
+"""Unit tests for the code analyzers in `benchmark.validators`."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from benchmark.validators import (
+    MaintainabilityAnalyzer,
+    SecurityAnalyzer,
+    _prompt1_users_payload,
+)
+
+_LEAKY = 'password = "hunter2hunter2"\nq = "SELECT * FROM t WHERE id=" + user_id\n'
+
+
+@pytest.mark.unit
+def test_analysis_is_memoized_but_returns_independent_results():
+    first = SecurityAnalyzer.analyze_code_security(_LEAKY)
+    first["issues"]["hardcoded_secret"].append("mutated by caller")
+    first["all_issues"].clear()
+
+    second = SecurityAnalyzer.analyze_code_security(_LEAKY)
+    assert second["issues"]["hardcoded_secret"] == ["Hardcoded password"]
+    assert ("sql_injection", "Potential SQL injection via string concatenation") in second[
+        "all_issues"
+    ]
+    assert second["score"] == first["score"]
+
+
+@pytest.mark.unit
+def test_memoized_analysis_is_per_analyzer_class():
+    code = "a = 1\n"
+    assert MaintainabilityAnalyzer.analyze_code_maintainability(code)["max_score"] == 2.0
+    assert SecurityAnalyzer.analyze_code_security(code)["max_score"] == 5.0
+
+
+@pytest.mark.unit
+def test_code_duplication_needs_a_non_overlapping_repeat():
+    block = ["total = compute(a)", "value = compute(b)", "result = total + value"]
+    dup = [("code_duplication", "Repeated code block detected")]
+
+    # A run of one repeated line only yields overlapping windows until the
+    # sixth copy, whose window starts three lines after the first.
+    line = "counter = counter + 1"
+    assert MaintainabilityAnalyzer.check_code_duplication("\n".join([line] * 5)) == []
+    assert MaintainabilityAnalyzer.check_code_duplication("\n".join([line] * 6)) == dup
+
+    assert MaintainabilityAnalyzer.check_code_duplication("\n".join(block + block)) == dup
+    commented = ["# same comment here", *block[1:]]
+    assert MaintainabilityAnalyzer.check_code_duplication("\n".join(commented * 2)) == []
+
+
+@pytest.mark.unit
+def test_prompt1_users_payload_normalises_shape():
+    users = [{"id": "1"}]
+    assert json.loads(_prompt1_users_payload(users)) == {"users": users}
+    assert json.loads(_prompt1_users_payload({"users": users})) == {"users": users}
+    for unusable in (None, {"people": users}, "users"):
+        assert _prompt1_users_payload(unusable) == _prompt1_users_payload(None)
+    assert [u["id"] for u in json.loads(_prompt1_users_payload(None))["users"]] == [
+        "101",
+        "102",
+        "103",
+    ]
+
+
+@pytest.mark.unit
+def test_secret_prefilter_keeps_ignorecase_matches():
+    # U+017F (long s) matches "s" under re.IGNORECASE but lowercases to itself
+    code = 'pa\u017fsword = "hunter2hunter2"\n'
+    assert SecurityAnalyzer.check_hardcoded_secrets(code) == [
+        ("hardcoded_secret", "Hardcoded password")
+    ]
+    assert SecurityAnalyzer.check_hardcoded_secrets('TOKEN = "x"\n# é\n') == []